@@ -1,37 +1,135 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
+import numpy as np
+import queue
 import threading
 import time
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from Quartz.CoreGraphics import (
-    CGEventCreateMouseEvent, CGEventPost,
+    CGEventCreate, CGEventCreateMouseEvent, CGEventGetLocation,
+    CGEventPost, CGEventSetLocation,
+    CGMainDisplayID, CGDisplayPixelsWide, CGDisplayPixelsHigh,
     kCGHIDEventTap, kCGEventLeftMouseDown, kCGEventLeftMouseUp
 )
-import pyautogui
 
 STOP_FLAG = False
 DRAW_THREAD = None
-screen_w, screen_h = pyautogui.size()
-
-def quartz_click(x, y):
+_display = CGMainDisplayID()
+screen_w, screen_h = CGDisplayPixelsWide(_display), CGDisplayPixelsHigh(_display)
+
+def mouse_pos():
+    """Current cursor position straight from Quartz (no pyautogui wrapper)."""
+    loc = CGEventGetLocation(CGEventCreate(None))
+    return int(loc.x), int(loc.y)
+
+def make_click_event_pair():
+    """Preallocated down/up events — quartz_click just moves them, avoiding
+    two PyObjC allocations per click. Each thread posting clicks needs its
+    own pair: the events are mutable and unsynchronized."""
+    return (CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, (0, 0), 0),
+            CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, (0, 0), 0))
+
+
+_EV_DOWN, _EV_UP = make_click_event_pair()
+
+# Gap between mouse-down and mouse-up. 0 skips the sleep entirely —
+# most games accept zero-interval down/up pairs.
+DOWN_UP_GAP_S = 0.0
+
+def _precise_sleep(s):
+    """Sleep s seconds; busy-spin below 2 ms where the kernel timer is too coarse."""
+    if s <= 0:
+        return
+    if s < 0.002:
+        end = time.perf_counter() + s
+        while time.perf_counter() < end:
+            pass
+    else:
+        time.sleep(s)
+
+def quartz_click(x, y, gap_s=None,
+                 _set_loc=CGEventSetLocation, _post=CGEventPost,
+                 _tap=kCGHIDEventTap, _down=_EV_DOWN, _up=_EV_UP):
     """
     Low-level click for macOS (Quartz) so clicks register in games/editors.
+
+    The trailing default args freeze the Quartz globals as locals —
+    LOAD_FAST instead of a LOAD_GLOBAL dict probe per click.
     """
-    ev_down = CGEventCreateMouseEvent(None, kCGEventLeftMouseDown, (x, y), 0)
-    CGEventPost(kCGHIDEventTap, ev_down)
-    time.sleep(0.01)
-    ev_up = CGEventCreateMouseEvent(None, kCGEventLeftMouseUp, (x, y), 0)
-    CGEventPost(kCGHIDEventTap, ev_up)
+    if gap_s is None:
+        gap_s = DOWN_UP_GAP_S
+    _set_loc(_down, (x, y))
+    _post(_tap, _down)
+    if gap_s > 0:
+        _precise_sleep(gap_s)
+    _set_loc(_up, (x, y))
+    _post(_tap, _up)
+
+def _click_targets(mask, row_has, origin_x, origin_y, cell_w, cell_h, sw, sh):
+    """
+    Flatten the mask into a compact (N, 2) int32 array of on-screen click
+    coordinates (serpentine order, empty rows skipped). JIT-compiled when
+    numba is installed; the NumPy fallback is the same loop.
+    """
+    n_rows, n_cols = mask.shape
+    out = np.empty((mask.size, 2), np.int32)
+    n = 0
+    for y in range(n_rows):
+        if not row_has[y]:
+            continue
+        ty = int(origin_y + y * cell_h)
+        if ty < 0 or ty >= sh:
+            continue
+        rng = range(n_cols - 1, -1, -1) if y & 1 else range(n_cols)
+        for x in rng:
+            if mask[y, x]:
+                tx = int(origin_x + x * cell_w)
+                if 0 <= tx < sw:
+                    out[n, 0] = tx
+                    out[n, 1] = ty
+                    n += 1
+    return out[:n]
+
+if NUMBA_AVAILABLE:
+    _click_targets = njit(cache=True)(_click_targets)
+
 
 def pixelate_and_threshold(img, res, thresh):
     """
     Resize the image to (res x res) and threshold to B/W.
+
+    Returns (preview_image, mask) where preview_image is a grayscale PIL
+    image for display and mask is a res x res bool array, True where a
+    pixel should be clicked (black). No RGB round-trip — the draw loop
+    only ever needs the mask.
     """
-    small = img.resize((res, res), Image.BILINEAR)
+    if res < min(img.size):
+        # BOX touches each source pixel once in C; a reduce() prepass
+        # handles the bulk of large integer downscales even faster.
+        factor = max(1, min(img.size) // res)
+        small = img.reduce(factor) if factor > 1 else img
+        small = small.resize((res, res), Image.BOX)
+    else:
+        small = img.resize((res, res), Image.BILINEAR)
     gray = small.convert("L")
-    bw = gray.point(lambda x: 0 if x < thresh else 255, "1")
-    return bw.convert("RGB")
+    a = np.asarray(gray)
+    # degenerate thresholds (all-white / all-black) short-circuit on a
+    # single min/max reduction — common while scrubbing parameters
+    if int(a.min()) >= thresh:
+        mask = np.zeros(a.shape, dtype=bool)
+    elif int(a.max()) < thresh:
+        mask = np.ones(a.shape, dtype=bool)
+    else:
+        mask = a < thresh
+    preview = Image.fromarray(np.where(mask, np.uint8(0), np.uint8(255)), "L")
+    return preview, mask
 
 class PixelArtGridDrawer:
     def __init__(self, master):
@@ -40,7 +138,11 @@ class PixelArtGridDrawer:
 
         self.original_img = None
         self.preview_img = None
+        self.preview_mask = None
+        self.row_has = None
         self.tk_preview = None
+        self._canvas_img = None
+        self._preview_cache = {}
 
         # grid corners & cell size
         self.tl_x = None
@@ -82,6 +184,11 @@ class PixelArtGridDrawer:
         self.delay_entry.grid(row=2, column=1)
         self.delay_entry.insert(0, "0.0")
 
+        tk.Label(param_frame, text="Click hold (ms):").grid(row=3, column=0, sticky="e")
+        self.hold_entry = tk.Entry(param_frame, width=6)
+        self.hold_entry.grid(row=3, column=1)
+        self.hold_entry.insert(0, "0.0")
+
         tk.Button(param_frame, text="Preview", command=self.update_preview).grid(row=0, column=2, rowspan=3, padx=8)
 
         # grid corners
@@ -116,6 +223,8 @@ class PixelArtGridDrawer:
             return
         self.status_lbl.config(text="Image loaded — enter params and press Preview.")
         self.preview_img = None
+        self.preview_mask = None
+        self._preview_cache.clear()
         self.btn_tl.config(state="disabled")
         self.btn_br.config(state="disabled")
         self.btn_center.config(state="disabled")
@@ -133,10 +242,51 @@ class PixelArtGridDrawer:
             return
 
         # pixelate & threshold
-        self.preview_img = pixelate_and_threshold(self.original_img, res, thresh)
-        disp = self.preview_img.resize((360, 360), Image.NEAREST)
-        self.tk_preview = ImageTk.PhotoImage(disp)
-        self.canvas.create_image(0,0,anchor="nw", image=self.tk_preview)
+        self.status_lbl.config(text="Building preview…")
+        threading.Thread(target=self._build_preview, args=(res, thresh), daemon=True).start()
+
+    def _build_preview(self, res, thresh):
+        """Heavy PIL/NumPy work off the Tk main thread; blit via after()."""
+        try:
+            key = (id(self.original_img), res, thresh)
+            cached = self._preview_cache.get(key)
+            if cached is None:
+                cached = pixelate_and_threshold(self.original_img, res, thresh)
+                self._preview_cache[key] = cached
+            preview_img, mask = cached
+            row_has = mask.any(axis=1)
+            # nearest upscale as two np.repeat passes (pure memcpy in C);
+            # edge-pad the remainder so the canvas is exactly 360x360
+            k = 360 // res
+            if k >= 1:
+                big = np.repeat(np.repeat(np.asarray(preview_img), k, axis=0), k, axis=1)
+                pad_y, pad_x = 360 - big.shape[0], 360 - big.shape[1]
+                if pad_y or pad_x:
+                    big = np.pad(big, ((0, pad_y), (0, pad_x)), mode="edge")
+                disp = Image.fromarray(big, "L")
+            else:
+                disp = preview_img.resize((360, 360), Image.NEAREST)
+        except Exception as e:
+            # surface the failure instead of leaving the UI stuck on
+            # "Building preview…" with a dead worker thread; format now —
+            # the `as e` binding is gone by the time Tk runs the lambda
+            msg = f"Preview failed: {e}"
+            self._ui(lambda: self.status_lbl.config(text=msg))
+            return
+        self._ui(lambda: self._install_preview(preview_img, mask, row_has, disp))
+
+    def _install_preview(self, preview_img, mask, row_has, disp):
+        self.preview_img = preview_img
+        self.preview_mask = mask
+        self.row_has = row_has
+        # reuse the PhotoImage and canvas item after the first preview —
+        # the display size is fixed at 360x360, so paste() updates in place
+        if self.tk_preview is None:
+            self.tk_preview = ImageTk.PhotoImage(disp)
+            self._canvas_img = self.canvas.create_image(0, 0, anchor="nw", image=self.tk_preview)
+        else:
+            self.tk_preview.paste(disp)
+            self.canvas.itemconfig(self._canvas_img, image=self.tk_preview)
 
         self.status_lbl.config(text="Preview ready — define grid corners.")
         self.btn_tl.config(state="normal")
@@ -157,18 +307,18 @@ class PixelArtGridDrawer:
         self.stage = "center"
 
     def on_enter(self, event):
-        pos = pyautogui.position()
+        pos_x, pos_y = mouse_pos()
 
         if not hasattr(self, "stage") or self.preview_img is None:
             return
 
         if self.stage == "tl":
-            self.tl_x, self.tl_y = pos.x, pos.y
+            self.tl_x, self.tl_y = pos_x, pos_y
             self.status_lbl.config(text=f"Top-Left grid corner set at ({self.tl_x},{self.tl_y}) — set bottom-right.")
             self.stage = None
 
         elif self.stage == "br":
-            self.br_x, self.br_y = pos.x, pos.y
+            self.br_x, self.br_y = pos_x, pos_y
             self.status_lbl.config(text=f"Bottom-Right grid corner set at ({self.br_x},{self.br_y}).")
             self.stage = None
 
@@ -188,7 +338,7 @@ class PixelArtGridDrawer:
                 messagebox.showerror("Error", "Invalid resolution for grid calculation.")
 
         elif self.stage == "center":
-            self.center_x, self.center_y = pos.x, pos.y
+            self.center_x, self.center_y = pos_x, pos_y
             self.status_lbl.config(
                 text=f"Art center set at ({self.center_x},{self.center_y}) — ready to draw."
             )
@@ -210,45 +360,86 @@ class PixelArtGridDrawer:
         STOP_FLAG = True
         self.status_lbl.config(text="Stopping…")
 
+    def _ui(self, fn):
+        """Marshal a UI update onto the Tk main thread (Tk is not thread-safe)."""
+        self.master.after(0, fn)
+
     def draw_loop(self):
         global STOP_FLAG
 
         try:
             res = int(self.res_entry.get())
             delay_s = float(self.delay_entry.get()) / 1000.0
+            hold_s = float(self.hold_entry.get()) / 1000.0
         except ValueError:
-            messagebox.showerror("Error", "Invalid numeric input for drawing.")
+            self._ui(lambda: self.status_lbl.config(text="Invalid numeric input for drawing."))
+            self._ui(lambda: self.stop_btn.config(state="disabled"))
+            self._ui(lambda: self.draw_btn.config(state="normal"))
             return
 
-        pixels = self.preview_img.load()
-
         # origin = top-left based on center
         origin_x = self.center_x - self.cell_w * (res - 1)/2
         origin_y = self.center_y - self.cell_h * (res - 1)/2
 
+        # compact array of all click targets, built in one native pass
+        targets = _click_targets(
+            self.preview_mask, self.row_has,
+            origin_x, origin_y, self.cell_w, self.cell_h,
+            screen_w, screen_h
+        )
+
         time.sleep(0.1)
-        count = 0
-        for y in range(res):
-            if STOP_FLAG:
-                break
-            for x in range(res):
-                if STOP_FLAG:
+
+        # Worker pool: overlap the PyObjC bridge overhead of one click with
+        # event delivery of the previous ones. SimpleQueue has a C fast path.
+        n_workers = 4
+        q = queue.SimpleQueue()
+        counts = [0] * n_workers
+
+        # EMA of observed posting latency; reset per draw. Used to back off
+        # automatically when the event tap is congested (races between
+        # workers are benign — it's a smoothed estimate).
+        self._post_s_ema = 0.0
+
+        def worker(wi):
+            # own event pair per worker — quartz_click mutates the events
+            # it posts, so sharing the module pair across threads would
+            # interleave locations and land clicks at the wrong pixels
+            ev_down, ev_up = make_click_event_pair()
+            while True:
+                item = q.get()
+                if item is None:
                     break
-                if pixels[x, y] == (0, 0, 0):
-                    tx = origin_x + x*self.cell_w
-                    ty = origin_y + y*self.cell_h
-                    tx, ty = int(tx), int(ty)
-                    if 0 <= tx < screen_w and 0 <= ty < screen_h:
-                        quartz_click(tx, ty)
-                        count += 1
-                        if delay_s > 0:
-                            time.sleep(delay_s)
-
-        self.status_lbl.config(
-            text=f"Finished {count} clicks." if not STOP_FLAG else "Drawing stopped."
-        )
-        self.stop_btn.config(state="disabled")
-        self.draw_btn.config(state="normal")
+                if STOP_FLAG:
+                    continue  # keep draining so join() returns promptly
+                t0 = time.perf_counter()
+                quartz_click(item[0], item[1], hold_s, _down=ev_down, _up=ev_up)
+                post_s = time.perf_counter() - t0
+                ema = self._post_s_ema
+                self._post_s_ema = post_s if ema == 0.0 else 0.8 * ema + 0.2 * post_s
+                counts[wi] += 1
+                effective_delay = max(delay_s, 0.5 * self._post_s_ema)
+                if effective_delay > 0:
+                    _precise_sleep(effective_delay)
+
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(n_workers)]
+        for w in workers:
+            w.start()
+        # drain the precomputed targets; STOP_FLAG checked every 64 entries
+        for i in range(targets.shape[0]):
+            if (i & 63) == 0 and STOP_FLAG:
+                break
+            q.put((int(targets[i, 0]), int(targets[i, 1])))
+        for _ in workers:
+            q.put(None)
+        for w in workers:
+            w.join()
+        count = sum(counts)
+
+        done_text = f"Finished {count} clicks." if not STOP_FLAG else "Drawing stopped."
+        self._ui(lambda: self.status_lbl.config(text=done_text))
+        self._ui(lambda: self.stop_btn.config(state="disabled"))
+        self._ui(lambda: self.draw_btn.config(state="normal"))
 
 print("[APP] Real Canvas Grid Pixel Drawer")
 root = tk.Tk()
@@ -1,3 +1,10 @@
+import collections
+import ctypes
+import gc
+import hashlib
+import io
+import os
+import sys
 import time
 import threading
 import json
@@ -8,9 +15,28 @@ from typing import Optional, Dict, Any, List, Tuple
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from tkinter import ttk
 
-import mido
+import numpy as np
+
+# mido, tkinter.ttk and pynput are deferred to first use — they are a
+# noticeable slice of cold-start time and none are needed to get the
+# window on screen.
+
+# orjson parses/serializes presets several times faster; stdlib fallback
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
 
 # ===========================
 # Cross-platform keyboard controller
@@ -21,14 +47,16 @@ try:
     from Quartz.CoreGraphics import (
         CGEventCreateKeyboardEvent,
         CGEventPost,
-        kCGHIDEventTap
+        CGEventSetIntegerValueField,
+        kCGHIDEventTap,
+        kCGKeyboardEventKeycode
     )
     QUARTZ_AVAILABLE = True
 except ImportError:
     QUARTZ_AVAILABLE = False
 
-if not QUARTZ_AVAILABLE:
-    from pynput.keyboard import Controller as PynputController
+WINDOWS = sys.platform == "win32"
+
 
 
 # macOS character-to-keycode mapping (for Quartz)
@@ -44,46 +72,199 @@ CHAR_TO_KEYCODE = {
     '+': 24,  # same as '='
 }
 
+# Flat ASCII-indexed keycode table: one bounds check + array load per
+# lookup instead of a dict hash on the hot key path.
+_KEYCODES: List[Optional[int]] = [None] * 128
+for _c, _k in CHAR_TO_KEYCODE.items():
+    _KEYCODES[ord(_c)] = _k
 
-class QuartzKeyController:
-    """Quartz-based keyboard controller for macOS (low-level events)."""
+if QUARTZ_AVAILABLE:
+    # Preallocated down/up events; press/release only swap the keycode.
+    _KEY_EV_DOWN = CGEventCreateKeyboardEvent(None, 0, True)
+    _KEY_EV_UP = CGEventCreateKeyboardEvent(None, 0, False)
+
+    class QuartzKeyController:
+        """Quartz-based keyboard controller for macOS (low-level events)."""
+
+        # Default args freeze the Quartz globals as locals on the hot path.
+        @staticmethod
+        def press(char: str, _codes=_KEYCODES, _set=CGEventSetIntegerValueField,
+                  _post=CGEventPost, _tap=kCGHIDEventTap,
+                  _field=kCGKeyboardEventKeycode, _ev=_KEY_EV_DOWN) -> None:
+            """Press a key down."""
+            o = ord(char)
+            code = _codes[o] if o < 128 else None
+            if code is not None:
+                _set(_ev, _field, code)
+                _post(_tap, _ev)
+
+        @staticmethod
+        def release(char: str, _codes=_KEYCODES, _set=CGEventSetIntegerValueField,
+                    _post=CGEventPost, _tap=kCGHIDEventTap,
+                    _field=kCGKeyboardEventKeycode, _ev=_KEY_EV_UP) -> None:
+            """Release a key."""
+            o = ord(char)
+            code = _codes[o] if o < 128 else None
+            if code is not None:
+                _set(_ev, _field, code)
+                _post(_tap, _ev)
+
+        @classmethod
+        def press_many(cls, keys) -> None:
+            """Press a whole chord (Quartz has no batch post; tight loop)."""
+            for k in keys:
+                cls.press(k)
+
+        @classmethod
+        def release_many(cls, keys) -> None:
+            """Release a whole chord."""
+            for k in keys:
+                cls.release(k)
+
+
+if WINDOWS:
+    from ctypes import wintypes
+
+    # DirectInput (set 1) scancodes for the US layout — games that read
+    # DirectInput ignore VK-based input, so send scancodes directly.
+    CHAR_TO_SCANCODE = {
+        '1': 0x02, '2': 0x03, '3': 0x04, '4': 0x05, '5': 0x06,
+        '6': 0x07, '7': 0x08, '8': 0x09, '9': 0x0A, '0': 0x0B,
+        '-': 0x0C, '=': 0x0D,
+        'q': 0x10, 'w': 0x11, 'e': 0x12, 'r': 0x13, 't': 0x14,
+        'y': 0x15, 'u': 0x16, 'i': 0x17, 'o': 0x18, 'p': 0x19,
+        '[': 0x1A, ']': 0x1B,
+        'a': 0x1E, 's': 0x1F, 'd': 0x20, 'f': 0x21, 'g': 0x22,
+        'h': 0x23, 'j': 0x24, 'k': 0x25, 'l': 0x26, ';': 0x27,
+        "'": 0x28,
+        'z': 0x2C, 'x': 0x2D, 'c': 0x2E, 'v': 0x2F, 'b': 0x30,
+        'n': 0x31, 'm': 0x32, ',': 0x33, '.': 0x34, '/': 0x35,
+        '+': 0x0D,  # same as '='
+    }
 
-    @staticmethod
-    def press(char: str) -> None:
-        """Press a key down."""
-        code = CHAR_TO_KEYCODE.get(char)
-        if code is not None:
-            event = CGEventCreateKeyboardEvent(None, code, True)
-            CGEventPost(kCGHIDEventTap, event)
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_SCANCODE = 0x0008
+    _KEYEVENTF_KEYUP = 0x0002
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.POINTER(wintypes.ULONG)),
+        ]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [
+            ("type", wintypes.DWORD),
+            ("ki", _KEYBDINPUT),
+            ("_pad", ctypes.c_byte * 8),  # pad to the union's full size
+        ]
+
+    _SendInput = ctypes.windll.user32.SendInput
+
+    class WindowsScanCodeController:
+        """SendInput-based controller emitting DirectInput scancodes."""
+
+        @staticmethod
+        def _send(char: str, up: bool) -> None:
+            scan = CHAR_TO_SCANCODE.get(char)
+            if scan is None:
+                return
+            flags = _KEYEVENTF_SCANCODE | (_KEYEVENTF_KEYUP if up else 0)
+            inp = _INPUT(type=_INPUT_KEYBOARD,
+                         ki=_KEYBDINPUT(0, scan, flags, 0, None))
+            _SendInput(1, ctypes.byref(inp), ctypes.sizeof(_INPUT))
+
+        def press(self, char: str) -> None:
+            """Press a key down."""
+            self._send(char, up=False)
+
+        def release(self, char: str) -> None:
+            """Release a key."""
+            self._send(char, up=True)
+
+        @staticmethod
+        def _send_many(keys, up: bool) -> None:
+            """One SendInput syscall for a whole chord's worth of events."""
+            scans = [s for s in (CHAR_TO_SCANCODE.get(k) for k in keys)
+                     if s is not None]
+            if not scans:
+                return
+            flags = _KEYEVENTF_SCANCODE | (_KEYEVENTF_KEYUP if up else 0)
+            arr = (_INPUT * len(scans))()
+            for i, scan in enumerate(scans):
+                arr[i] = _INPUT(type=_INPUT_KEYBOARD,
+                                ki=_KEYBDINPUT(0, scan, flags, 0, None))
+            _SendInput(len(scans), arr, ctypes.sizeof(_INPUT))
 
-    @staticmethod
-    def release(char: str) -> None:
-        """Release a key."""
-        code = CHAR_TO_KEYCODE.get(char)
-        if code is not None:
-            event = CGEventCreateKeyboardEvent(None, code, False)
-            CGEventPost(kCGHIDEventTap, event)
+        def press_many(self, keys) -> None:
+            """Press a whole chord in one syscall."""
+            self._send_many(keys, up=False)
+
+        def release_many(self, keys) -> None:
+            """Release a whole chord in one syscall."""
+            self._send_many(keys, up=True)
 
 
 class PynputKeyController:
-    """Pynput-based keyboard controller for Windows/cross-platform."""
+    """Pynput-based keyboard controller for Linux/cross-platform.
+
+    pynput itself is imported on first key event, not at startup.
+    """
 
     def __init__(self):
-        self._controller = PynputController()
+        self._controller = None
+        # char -> KeyCode, so pynput's per-call string parsing runs once
+        # per distinct key instead of once per tap
+        self._keycodes: Dict[str, Any] = {}
+
+    def _ctl(self):
+        ctl = self._controller
+        if ctl is None:
+            from pynput.keyboard import Controller
+            ctl = self._controller = Controller()
+        return ctl
+
+    def _key(self, char: str):
+        kc = self._keycodes.get(char)
+        if kc is None:
+            from pynput.keyboard import KeyCode
+            kc = self._keycodes[char] = KeyCode.from_char(char)
+        return kc
 
     def press(self, char: str) -> None:
         """Press a key down."""
-        self._controller.press(char)
+        self._ctl().press(self._key(char))
 
     def release(self, char: str) -> None:
         """Release a key."""
-        self._controller.release(char)
+        self._ctl().release(self._key(char))
+
+    def press_many(self, keys) -> None:
+        """Press a whole chord via the controller directly, skipping the
+        per-key wrapper dispatch."""
+        ctl = self._ctl()
+        key = self._key
+        for k in keys:
+            ctl.press(key(k))
+
+    def release_many(self, keys) -> None:
+        """Release a whole chord."""
+        ctl = self._ctl()
+        key = self._key
+        for k in keys:
+            ctl.release(key(k))
 
 
 # Auto-select the appropriate controller
 if QUARTZ_AVAILABLE:
     kb = QuartzKeyController()
     print("[Keyboard] Using Quartz (macOS native)")
+elif WINDOWS:
+    kb = WindowsScanCodeController()
+    print("[Keyboard] Using SendInput scancodes (Windows native)")
 else:
     kb = PynputKeyController()
     print("[Keyboard] Using pynput (cross-platform)")
@@ -91,6 +272,7 @@ else:
 APP_DIR = Path.cwd()
 MIDIS_DIR = APP_DIR / "midis"
 CONFIG_FILE = APP_DIR / "presets.json"
+SCHEDULE_CACHE_DIR = MIDIS_DIR / ".cache"
 
 # =========================================================
 # 15-key layout (YOUR PROVIDED ORDER)
@@ -162,7 +344,31 @@ def get_keymaps(use_windows: bool):
     return LOW, MID, HIGH, HIGH_PLUS_C
 
 
-@dataclass
+# =========================================================
+# Flat keymap tables (hot path)
+# =========================================================
+# midi_note_to_key used to rebuild the LOW/MID/HIGH dicts per note; these
+# precomputed 37-byte tables are indexed directly by d = note - base_c
+# (0 = unmapped).
+
+def _flat_keymap_21(use_windows: bool) -> bytes:
+    LOW, MID, HIGH, HIGH_PLUS_C = get_keymaps(use_windows)
+    flat: List[Optional[str]] = [None] * 37
+    for s, k in LOW.items():
+        flat[s] = k
+    for s, k in MID.items():
+        flat[12 + s] = k
+    for s, k in HIGH.items():
+        flat[24 + s] = k
+    flat[36] = HIGH_PLUS_C
+    return bytes(ord(k) if k is not None else 0 for k in flat)
+
+
+KEYMAP_21_MAC = _flat_keymap_21(False)
+KEYMAP_21_WIN = _flat_keymap_21(True)
+
+
+@dataclass(slots=True)
 class Config:
     midi_path: str = ""
     base_c_midi: int = 48
@@ -187,21 +393,36 @@ class Config:
     squeeze_lo: int = 3
     squeeze_hi: int = 11
 
+    def build_note_lut(self) -> List[Optional[str]]:
+        """Resolve every MIDI note to its key char under this config.
+
+        Built once per play (the config is frozen while playing); the
+        playback loop then maps notes with a single list index.
+        """
+        return [midi_note_to_key(n, self) for n in range(128)]
+
 
 def clamp_int(x: int, lo: int, hi: int) -> int:
     return lo if x < lo else hi if x > hi else x
 
 
 def squeeze_index(idx_0_14: int, lo: int, hi: int) -> int:
-    """Map 0..14 into lo..hi monotonically."""
-    idx = clamp_int(idx_0_14, 0, 14)
-    lo = clamp_int(lo, 0, 14)
-    hi = clamp_int(hi, 0, 14)
+    """Map 0..14 into lo..hi monotonically.
+
+    All three inputs are clamped here: typed spinbox values and
+    hand-edited presets reach this unsanitized via test_note /
+    _update_test_button_text / apply_preset, and an out-of-range result
+    would index past KEYS_15. min/max are C builtins, cheaper than the
+    old Python-level clamp_int frames.
+    """
+    lo = max(0, min(14, lo))
+    hi = max(0, min(14, hi))
     if lo > hi:
         lo, hi = hi, lo
     if lo == hi:
         return lo
-    return clamp_int(lo + round(idx * (hi - lo) / 14.0), lo, hi)
+    idx = max(0, min(14, idx_0_14))
+    return max(lo, min(hi, lo + round(idx * (hi - lo) / 14.0)))
 
 
 def _quantize_to_white_floor(semitone: int) -> int:
@@ -214,6 +435,19 @@ def _quantize_to_white_floor(semitone: int) -> int:
     return 0
 
 
+def _build_idx_15_diatonic() -> Tuple[Optional[int], ...]:
+    """Semitone offset d -> KEYS_15 index (None = off the 15-key range)."""
+    out: List[Optional[int]] = []
+    for d in range(36):
+        degree = SEMITONE_TO_DEGREE[_quantize_to_white_floor(d % 12)]
+        idx = (d // 12) * 7 + degree
+        out.append(idx if idx < 15 else None)
+    return tuple(out)
+
+
+IDX_15_DIATONIC = _build_idx_15_diatonic()
+
+
 def midi_note_to_key(note: int, cfg: Config) -> Optional[str]:
     note += cfg.transpose
     d = note - cfg.base_c_midi
@@ -223,91 +457,266 @@ def midi_note_to_key(note: int, cfg: Config) -> Optional[str]:
     if cfg.use_15_keys:
         # ---------- 15-key chromatic (includes half-steps) ----------
         if cfg.chromatic_15:
-            idx = d  # 1 MIDI note step = 1 semitone
-            if not (0 <= idx < 15):
+            if d >= 15:
                 return None
-            if cfg.squeeze_enabled:
-                idx = squeeze_index(idx, cfg.squeeze_lo, cfg.squeeze_hi)
-            return KEYS_15[idx]
-
+            idx = d  # 1 MIDI note step = 1 semitone
         # ---------- 15-key diatonic-only (white notes) ----------
-        octave = d // 12
-        semitone = d % 12
-        semitone = _quantize_to_white_floor(semitone)
-        degree = SEMITONE_TO_DEGREE[semitone]  # 0..6
-        idx = octave * 7 + degree
-        if not (0 <= idx < 15):
-            return None
+        else:
+            if d >= len(IDX_15_DIATONIC):
+                return None
+            idx = IDX_15_DIATONIC[d]
+            if idx is None:
+                return None
         if cfg.squeeze_enabled:
             idx = squeeze_index(idx, cfg.squeeze_lo, cfg.squeeze_hi)
         return KEYS_15[idx]
 
     # ---------- 21-key mode ----------
-    LOW, MID, HIGH, HIGH_PLUS_C = get_keymaps(cfg.use_windows_map)
-    octave = d // 12
-    semitone = d % 12
-    if octave == 0:
-        return LOW.get(semitone)
-    if octave == 1:
-        return MID.get(semitone)
-    if octave == 2:
-        return HIGH.get(semitone)
-    if octave == 3 and semitone == 0:
-        return HIGH_PLUS_C
+    keymap = KEYMAP_21_WIN if cfg.use_windows_map else KEYMAP_21_MAC
+    if d < len(keymap) and keymap[d]:
+        return chr(keymap[d])
     return None
 
 
-def collect_abs_timed_messages(midi_path: str) -> List[Tuple[float, mido.Message]]:
-    """Iterating MidiFile gives playback order; msg.time is seconds since previous."""
-    mid = mido.MidiFile(midi_path)
-    out: List[Tuple[float, mido.Message]] = []
-    t = 0.0
-    for msg in mid:
-        t += float(msg.time or 0.0)
-        out.append((t, msg))
-    return out
+DEFAULT_TEMPO = 500000  # mido's default, µs per beat
+
+# event kind codes for the SoA arrays
+KIND_META = 0
+KIND_NOTE_ON = 1
+KIND_NOTE_OFF = 2
+KIND_OTHER = 3
+
+
+@dataclass(slots=True)
+class NoteStream:
+    """Parsed MIDI event stream as parallel arrays (SoA)."""
+    times: np.ndarray            # float64 absolute seconds
+    msgs: List["mido.Message"]   # original message objects, playback order
+    kinds: np.ndarray            # uint8 KIND_* codes
+    notes: np.ndarray            # uint8 MIDI notes (0 for non-note events)
+    vels: np.ndarray             # uint8 velocities (0 for non-note events)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+def _merge_tracks_ticks(tracks) -> Tuple[np.ndarray, List["mido.Message"]]:
+    """Merge tracks in the tick domain without copying messages.
+
+    Replicates mido.merge_tracks ordering — stable sort on absolute tick,
+    intermediate end_of_track messages dropped, one final end_of_track —
+    but per-track tick accumulation is a NumPy cumsum and the merge is a
+    stable argsort, instead of two message-copy passes plus a keyed sort.
+    """
+    import mido
+
+    tick_chunks: List[np.ndarray] = []
+    msgs: List["mido.Message"] = []
+    end_tick = 0
+    for track in tracks:
+        if not len(track):
+            continue
+        abs_ticks = np.cumsum(np.fromiter((m.time for m in track),
+                                          dtype=np.int64, count=len(track)))
+        end_tick = max(end_tick, int(abs_ticks[-1]))
+        keep = [i for i, m in enumerate(track) if m.type != "end_of_track"]
+        if not keep:
+            continue
+        tick_chunks.append(abs_ticks[keep])
+        msgs.extend(track[i] for i in keep)
+
+    if tick_chunks:
+        ticks = np.concatenate(tick_chunks)
+        order = np.argsort(ticks, kind="stable")
+        ticks = ticks[order]
+        msgs = [msgs[i] for i in order]
+    else:
+        ticks = np.empty(0, dtype=np.int64)
+
+    msgs.append(mido.MetaMessage("end_of_track"))
+    return np.append(ticks, end_tick), msgs
+
+
+def collect_abs_timed_messages(midi_path: str) -> NoteStream:
+    """Merged playback-order messages with absolute times in seconds.
+
+    Returns a NoteStream whose uint8 kind/note/velocity columns let the
+    playback loop read plain ints instead of doing attribute lookups on
+    every mido.Message. Track merging happens in the tick domain and
+    tick deltas become seconds in one vectorized pass over the tempo
+    map. Message .time fields keep their original per-track tick deltas.
+    """
+    import mido  # deferred: cold start shouldn't pay for the MIDI library
+
+    # slurp the file once and let mido parse from memory — its reader
+    # does many tiny read() calls that are far cheaper against BytesIO
+    with open(midi_path, "rb") as f:
+        mid = mido.MidiFile(file=io.BytesIO(f.read()))
+    abs_ticks, merged = _merge_tracks_ticks(mid.tracks)
+    n = len(merged)
+    if n == 0:
+        empty_u8 = np.empty(0, dtype=np.uint8)
+        return NoteStream(np.empty(0, dtype=np.float64), [],
+                          empty_u8, empty_u8, empty_u8)
+
+    deltas = np.diff(abs_ticks, prepend=0)
+
+    # tempo active while each delta elapses: DEFAULT_TEMPO until the first
+    # set_tempo, which takes effect for the deltas after it
+    boundaries = [0]
+    tempos = [DEFAULT_TEMPO]
+    kinds = np.empty(n, dtype=np.uint8)
+    notes = np.zeros(n, dtype=np.uint8)
+    vels = np.zeros(n, dtype=np.uint8)
+    for i, m in enumerate(merged):
+        if m.is_meta:
+            kinds[i] = KIND_META
+            if m.type == "set_tempo":
+                boundaries.append(i + 1)
+                tempos.append(m.tempo)
+        elif m.type == "note_on":
+            kinds[i] = KIND_NOTE_ON
+            notes[i] = m.note
+            vels[i] = m.velocity
+        elif m.type == "note_off":
+            kinds[i] = KIND_NOTE_OFF
+            notes[i] = m.note
+        else:
+            kinds[i] = KIND_OTHER
+    lengths = np.diff(np.append(boundaries, n))
+    tempo_per_delta = np.repeat(tempos, lengths)
 
+    seconds = np.cumsum(deltas * (tempo_per_delta / (mid.ticks_per_beat * 1e6)))
+    return NoteStream(seconds, list(merged), kinds, notes, vels)
 
-def find_trim_window(timed: List[Tuple[float, mido.Message]]) -> Tuple[float, float]:
-    if not timed:
-        return 0.0, 0.0
 
-    start = None
-    end = None
-    last_time = timed[-1][0]
+def find_trim_window(times: np.ndarray, kinds: np.ndarray, vels: np.ndarray) -> Tuple[int, int]:
+    """Slice indices [i0, i1) from the first real note-on through the last
+    note event (equal-time neighbours included), as two vectorized scans —
+    callers slice the SoA arrays directly instead of re-filtering by time."""
+    if len(times) == 0:
+        return 0, 0
 
-    for t, msg in timed:
-        if msg.type == "note_on" and getattr(msg, "velocity", 0) > 0:
-            start = t
-            break
+    strike_mask = (kinds == KIND_NOTE_ON) & (vels > 0)
+    start = float(times[np.argmax(strike_mask)]) if strike_mask.any() else 0.0
 
-    for t, msg in reversed(timed):
-        if msg.type in ("note_off", "note_on"):
-            end = t
-            break
+    note_mask = (kinds == KIND_NOTE_ON) | (kinds == KIND_NOTE_OFF)
+    if note_mask.any():
+        end = float(times[len(note_mask) - 1 - int(np.argmax(note_mask[::-1]))])
+    else:
+        end = float(times[-1])
 
-    if start is None:
-        start = 0.0
-    if end is None:
-        end = last_time
     if end < start:
         end = start
-    return start, end
-
-
-def group_by_time(timed: List[Tuple[float, mido.Message]], eps: float = 1e-9):
-    if not timed:
-        return
-    i = 0
-    n = len(timed)
-    while i < n:
-        t0 = timed[i][0]
-        msgs = [timed[i][1]]
-        i += 1
-        while i < n and abs(timed[i][0] - t0) <= eps:
-            msgs.append(timed[i][1])
-            i += 1
-        yield t0, msgs
+    i0 = int(np.searchsorted(times, start, side="left"))
+    i1 = int(np.searchsorted(times, end, side="right"))
+    return i0, i1
+
+
+def group_boundaries(times: np.ndarray, eps: float = 1e-9) -> np.ndarray:
+    """Index array of chord boundaries: group k spans [bnd[k], bnd[k+1])."""
+    starts = np.flatnonzero(np.diff(times) > eps) + 1
+    return np.concatenate(([0], starts, [len(times)]))
+
+
+def boost_thread_priority() -> None:
+    """Best-effort bump of the calling thread's scheduling priority.
+
+    Tap durations go as low as 1 ms; a normal-priority thread can be
+    preempted for longer than that. Failures are ignored — this is an
+    optimization, not a requirement.
+    """
+    try:
+        if WINDOWS:
+            kernel32 = ctypes.windll.kernel32
+            # THREAD_PRIORITY_TIME_CRITICAL
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 15)
+        elif QUARTZ_AVAILABLE:
+            # QOS_CLASS_USER_INTERACTIVE
+            ctypes.CDLL(None).pthread_set_qos_class_self_np(0x21, 0)
+    except Exception:
+        pass
+
+
+def precise_sleep_until(deadline: float,
+                        _sleep=time.sleep, _pc=time.perf_counter) -> None:
+    """Coarse-sleep to ~1 ms before the deadline, then spin on perf_counter.
+
+    time.sleep alone wakes late by the kernel timer granularity; the
+    short busy-wait tail gives sub-millisecond dispatch without burning a
+    whole core for the bulk of the wait.
+    """
+    remaining = deadline - _pc()
+    if remaining > 0.002:
+        _sleep(remaining - 0.001)
+    while _pc() < deadline:
+        pass
+
+
+def build_schedule(times: np.ndarray, kinds: np.ndarray, notes: np.ndarray,
+                   vels: np.ndarray, note_to_key: List[Optional[str]],
+                   key_idx: Dict[str, int], always_tap: bool,
+                   inv_speed: float, tap_seconds: float):
+    """Flatten note events into a sorted press/release schedule.
+
+    Returns (ev_times, ev_keys, ev_press): wall-clock offsets (speed
+    already applied), key bit-indices into key_idx, and a press/release
+    flag. All decoding — velocity checks, note->key mapping, chord
+    dedupe, tap release synthesis — happens here, before the
+    time-critical loop, which is left with sleep + dispatch only.
+    """
+    ev_t: List[float] = []
+    ev_k: List[int] = []
+    ev_p: List[int] = []
+
+    # note -> key bit-index (-1 = unmapped): one list index per event
+    # instead of a char lookup plus a dict hash
+    note_to_ki = [-1 if k is None else key_idx[k] for k in note_to_key]
+
+    if always_tap:
+        bounds = group_boundaries(times)
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            seen_mask = 0
+            chord: List[int] = []
+            for i in range(a, b):
+                if kinds[i] == KIND_NOTE_ON and vels[i] > 0:
+                    ki = note_to_ki[notes[i]]
+                    if ki < 0:
+                        continue
+                    bit = 1 << ki
+                    if not seen_mask & bit:
+                        seen_mask |= bit
+                        chord.append(ki)
+            if chord:
+                wall = float(times[a]) * inv_speed
+                for ki in chord:
+                    ev_t.append(wall)
+                    ev_k.append(ki)
+                    ev_p.append(1)
+                for ki in chord:
+                    ev_t.append(wall + tap_seconds)
+                    ev_k.append(ki)
+                    ev_p.append(0)
+    else:
+        # hold mode emits events 1:1 with the input, so the whole branch
+        # vectorizes: masks for press/release, LUT applied with one take,
+        # and the input order (already time-sorted) is preserved
+        ki_arr = np.array(note_to_ki, dtype=np.int16)[notes]
+        press_mask = (kinds == KIND_NOTE_ON) & (vels > 0)
+        release_mask = (kinds == KIND_NOTE_OFF) | ((kinds == KIND_NOTE_ON) & (vels == 0))
+        valid = (ki_arr >= 0) & (press_mask | release_mask)
+        return (times[valid] * inv_speed,
+                ki_arr[valid].astype(np.uint8),
+                press_mask[valid].astype(np.uint8))
+
+    ev_times = np.array(ev_t, dtype=np.float64)
+    # tap releases land tap_seconds later, so re-sort; stable keeps the
+    # press-before-release order within identical timestamps
+    order = np.argsort(ev_times, kind="stable")
+    ev_times = ev_times[order]
+    ev_keys = np.array(ev_k, dtype=np.uint8)[order]
+    ev_press = np.array(ev_p, dtype=np.uint8)[order]
+    return ev_times, ev_keys, ev_press
 
 
 class App(tk.Tk):
@@ -320,12 +729,24 @@ class App(tk.Tk):
         self._stop_event = threading.Event()
         self._play_thread: Optional[threading.Thread] = None
 
+        self._presets_mtime: Optional[float] = None
+        self._save_pending = False
+        self._test_update_pending = False
+        self._log_queue: collections.deque = collections.deque()
         self.presets: Dict[str, Dict[str, Any]] = self._load_presets()
 
         self._build_ui()
         self._refresh_presets_dropdown()
         self._update_ui_states()
         self._update_test_button_text()
+        self.after(100, self._flush_logs)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        # don't lose a debounced preset save that hasn't flushed yet
+        if self._save_pending:
+            self._flush_presets()
+        self.destroy()
 
     # ---------- storage ----------
     def _ensure_dirs(self):
@@ -333,14 +754,15 @@ class App(tk.Tk):
         MIDIS_DIR.mkdir(parents=True, exist_ok=True)
 
     def _unique_dest(self, dest: Path) -> Path:
-        if not dest.exists():
+        # one scandir instead of a stat syscall per candidate name
+        existing = {entry.name for entry in os.scandir(dest.parent)}
+        if dest.name not in existing:
             return dest
         stem, suffix = dest.stem, dest.suffix
-        for i in range(1, 10_000):
-            cand = dest.with_name(f"{stem} ({i}){suffix}")
-            if not cand.exists():
-                return cand
-        raise RuntimeError("Too many duplicate MIDI filenames in storage folder.")
+        i = 1
+        while f"{stem} ({i}){suffix}" in existing:
+            i += 1
+        return dest.with_name(f"{stem} ({i}){suffix}")
 
     def _import_midi_to_storage(self, src_path: Path) -> Path:
         self._ensure_dirs()
@@ -352,22 +774,41 @@ class App(tk.Tk):
     def _load_presets(self) -> Dict[str, Dict[str, Any]]:
         try:
             if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                mtime = CONFIG_FILE.stat().st_mtime
+                if mtime == self._presets_mtime:
+                    return self.presets  # unchanged on disk — reuse cache
+                data = _json_loads(CONFIG_FILE.read_bytes())
                 if isinstance(data, dict):
+                    self._presets_mtime = mtime
                     return data
         except Exception:
             pass
         return {}
 
     def _save_presets(self) -> None:
+        # debounce bursts of saves into one deferred write
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self.after(200, self._flush_presets)
+
+    def _flush_presets(self) -> None:
+        self._save_pending = False
         self._ensure_dirs()
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.presets, f, indent=2)
+        tmp = CONFIG_FILE.with_suffix(".tmp")
+        tmp.write_bytes(_json_dumps(self.presets))
+        os.replace(tmp, CONFIG_FILE)  # atomic — never a half-written file
+        try:
+            self._presets_mtime = CONFIG_FILE.stat().st_mtime
+        except OSError:
+            pass
 
     def _refresh_presets_dropdown(self) -> None:
         names = sorted(self.presets.keys(), key=str.lower)
-        self.preset_combo["values"] = names
+        # only push to Tk when the list actually changed — the assignment
+        # rebuilds the widget's value list every time
+        if tuple(self.preset_combo["values"]) != tuple(names):
+            self.preset_combo["values"] = names
         if names and self.preset_var.get() not in names:
             self.preset_var.set(names[0])
             self.apply_preset()
@@ -478,6 +919,23 @@ class App(tk.Tk):
         self.log.insert("end", s + "\n")
         self.log.see("end")
 
+    def _log_async(self, s: str):
+        """Log from a worker thread: enqueue only, the UI timer drains.
+
+        Appending to a deque is all the playback thread ever pays; no Tk
+        event per line."""
+        self._log_queue.append(s)
+
+    def _flush_logs(self):
+        q = self._log_queue
+        if q:
+            lines = []
+            while q:
+                lines.append(q.popleft())
+            self.log.insert("end", "\n".join(lines) + "\n")
+            self.log.see("end")
+        self.after(100, self._flush_logs)
+
     def _slider(self, parent, label, var, a, b, step):
         row = tk.Frame(parent)
         row.pack(fill="x", pady=4)
@@ -504,6 +962,22 @@ class App(tk.Tk):
         self.squeeze_lo_spin.configure(state=state)
         self.squeeze_hi_spin.configure(state=state)
 
+    def _schedule_test_update(self):
+        """Coalesce bursts of slider/spinbox callbacks into one update.
+
+        Scale drags can fire dozens of times a second; the real update
+        builds a Config and runs the keymap, so defer it 50 ms and let
+        later callbacks ride the same pending call.
+        """
+        if self._test_update_pending:
+            return
+        self._test_update_pending = True
+        self.after(50, self._do_test_update)
+
+    def _do_test_update(self):
+        self._test_update_pending = False
+        self._update_test_button_text()
+
     def _update_test_button_text(self):
         tmp_cfg = Config(
             base_c_midi=int(self.base_c.get()),
@@ -526,6 +1000,8 @@ class App(tk.Tk):
 
     # ---------- UI ----------
     def _build_ui(self):
+        from tkinter import ttk  # deferred with the other heavy imports
+
         frm = tk.Frame(self, padx=12, pady=12)
         frm.pack(fill="both", expand=True)
 
@@ -608,7 +1084,7 @@ class App(tk.Tk):
             rowC,
             text="15-key mode (q w e r t y u i / a s d f g h j)",
             variable=self.use_15_keys,
-            command=lambda: (self._update_ui_states(), self._update_test_button_text())
+            command=lambda: (self._update_ui_states(), self._schedule_test_update())
         ).pack(side="left")
 
         rowC2 = tk.Frame(settings)
@@ -617,7 +1093,7 @@ class App(tk.Tk):
             rowC2,
             text="15-key chromatic (include half-steps; C, C#, D -> q, w, e)",
             variable=self.chromatic_15,
-            command=self._update_test_button_text
+            command=self._schedule_test_update
         )
         self.chromatic_chk.pack(side="left")
 
@@ -627,7 +1103,7 @@ class App(tk.Tk):
             rowD,
             text="21-key Windows keymap (black keys: 2 3 5 6 7 / S D G H J / . ' 0 - =)",
             variable=self.use_windows_map,
-            command=self._update_test_button_text
+            command=self._schedule_test_update
         )
         self.winmap_chk.pack(side="left")
 
@@ -641,7 +1117,7 @@ class App(tk.Tk):
             top_sq,
             text="Squeeze 15-key range (remap 0..14 into [lo..hi])",
             variable=self.squeeze_enabled,
-            command=lambda: (self._update_ui_states(), self._update_test_button_text())
+            command=lambda: (self._update_ui_states(), self._schedule_test_update())
         )
         self.squeeze_chk.pack(side="left")
 
@@ -651,14 +1127,14 @@ class App(tk.Tk):
         tk.Label(band, text="lo (0..14):", width=11, anchor="w").pack(side="left")
         self.squeeze_lo_spin = ttk.Spinbox(
             band, from_=0, to=14, increment=1, textvariable=self.squeeze_lo, width=6,
-            command=self._update_test_button_text
+            command=self._schedule_test_update
         )
         self.squeeze_lo_spin.pack(side="left", padx=(0, 12))
 
         tk.Label(band, text="hi (0..14):", width=11, anchor="w").pack(side="left")
         self.squeeze_hi_spin = ttk.Spinbox(
             band, from_=0, to=14, increment=1, textvariable=self.squeeze_hi, width=6,
-            command=self._update_test_button_text
+            command=self._schedule_test_update
         )
         self.squeeze_hi_spin.pack(side="left")
 
@@ -760,100 +1236,213 @@ class App(tk.Tk):
         self._stop_event.set()
         self._log("Stop requested.")
 
-    def _play_worker(self):
+    # ---------- schedule cache ----------
+    def _schedule_cache_path(self, midi_path: str) -> Optional[Path]:
+        """Cache file keyed by the MIDI file's identity and every setting
+        that shapes the schedule (speed included — times are stored
+        speed-adjusted)."""
         try:
-            midi_path = self.cfg.midi_path
-            if not Path(midi_path).exists():
-                self._ui(lambda: self._log(f"ERROR: MIDI missing: {midi_path}"))
-                return
-
-            self._ui(lambda: self._log(f"Lead-in {self.cfg.lead_in:.2f}s — focus game window now!"))
-            time.sleep(self.cfg.lead_in)
+            st = os.stat(midi_path)
+        except OSError:
+            return None
+        cfg = self.cfg
+        sig = (
+            f"{midi_path}:{st.st_mtime_ns}:{st.st_size}:"
+            f"{cfg.base_c_midi}:{cfg.transpose}:{cfg.speed}:{cfg.trim_silence}:"
+            f"{cfg.always_tap}:{cfg.tap_ms}:{cfg.use_windows_map}:"
+            f"{cfg.use_15_keys}:{cfg.chromatic_15}:"
+            f"{cfg.squeeze_enabled}:{cfg.squeeze_lo}:{cfg.squeeze_hi}"
+        )
+        digest = hashlib.blake2b(sig.encode("utf-8"), digest_size=8).hexdigest()
+        return SCHEDULE_CACHE_DIR / f"{digest}.npz"
 
-            timed = collect_abs_timed_messages(midi_path)
+    def _load_cached_schedule(self, cache_path: Optional[Path]):
+        try:
+            if cache_path is not None and cache_path.exists():
+                with np.load(cache_path) as z:
+                    return (z["ev_times"], z["ev_keys"], z["ev_press"],
+                            [str(c) for c in z["keys"]])
+        except Exception:
+            pass  # any corrupt/stale cache entry just means a re-parse
+        return None
 
-            if self.cfg.trim_silence and timed:
-                start_t, end_t = find_trim_window(timed)
-                timed = [(t, msg) for (t, msg) in timed if start_t <= t <= end_t]
-                self._ui(lambda: self._log(f"Trim: start={start_t:.3f}s end={end_t:.3f}s"))
+    def _save_cached_schedule(self, cache_path: Optional[Path], ev_times,
+                              ev_keys, ev_press, keys_by_bit) -> None:
+        if cache_path is None:
+            return
+        try:
+            SCHEDULE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            np.savez(cache_path, ev_times=ev_times, ev_keys=ev_keys,
+                     ev_press=ev_press, keys=np.array(keys_by_bit, dtype="U1"))
+        except Exception:
+            pass  # cache is best-effort only
 
-            if not timed:
-                self._ui(lambda: self._log("No messages to play (empty after trim)."))
+    def _play_worker(self):
+        if WINDOWS:
+            # default sleep granularity is ~15.6 ms — ask for 1 ms while
+            # playing so tap and inter-note waits don't quantize audibly
+            ctypes.windll.winmm.timeBeginPeriod(1)
+        boost_thread_priority()
+        try:
+            cfg = self.cfg  # snapshot reference; fastlocal for the rest
+            midi_path = cfg.midi_path
+            if not Path(midi_path).exists():
+                self._log_async(f"ERROR: MIDI missing: {midi_path}")
                 return
 
-            groups = list(group_by_time(timed))
-            prev_t = groups[0][0]
-            tap_seconds = max(0.001, self.cfg.tap_ms / 1000.0)
-
-            # optional hold-mode state (only if always_tap OFF)
-            key_down: Dict[str, bool] = {}
+            self._log_async(f"Lead-in {cfg.lead_in:.2f}s — focus game window now!")
+            lead_in_t0 = time.perf_counter()
+
+            # replays with the same file + settings skip parsing entirely
+            cache_path = self._schedule_cache_path(midi_path)
+            cached = self._load_cached_schedule(cache_path)
+            if cached is not None:
+                ev_times, ev_keys, ev_press, keys_by_bit = cached
+                self._log_async("Using cached schedule.")
+            else:
+                # cfg is frozen for the whole play — resolve every possible
+                # note once so scheduling is a single list index per event
+                note_to_key = cfg.build_note_lut()
+
+                # bit index per reachable key (≤37 of them) for set-free dedupe
+                key_idx: Dict[str, int] = {}
+                for k in note_to_key:
+                    if k is not None and k not in key_idx:
+                        key_idx[k] = len(key_idx)
+
+                stream = collect_abs_timed_messages(midi_path)
+                times, kinds, notes, vels = stream.times, stream.kinds, stream.notes, stream.vels
+
+                if cfg.trim_silence and len(times):
+                    i0, i1 = find_trim_window(times, kinds, vels)
+                    start_t = float(times[i0]) if i1 > i0 else 0.0
+                    end_t = float(times[i1 - 1]) if i1 > i0 else 0.0
+                    times = times[i0:i1]
+                    kinds, notes, vels = kinds[i0:i1], notes[i0:i1], vels[i0:i1]
+                    self._log_async(f"Trim: start={start_t:.3f}s end={end_t:.3f}s")
+
+                # playback only acts on note events — drop meta/other rows
+                # once, instead of re-testing them inside the loop
+                keep = (kinds == KIND_NOTE_ON) | (kinds == KIND_NOTE_OFF)
+                times, kinds, notes, vels = times[keep], kinds[keep], notes[keep], vels[keep]
+
+                if len(times) == 0:
+                    self._log_async("No messages to play (empty after trim).")
+                    return
+
+                tap_seconds = max(0.001, cfg.tap_ms / 1000.0)
+                inv_speed = 1.0 / max(cfg.speed, 1e-6)
+
+                # everything decodable is decoded here; the timed loop below
+                # only sleeps and dispatches press/release
+                ev_times, ev_keys, ev_press = build_schedule(
+                    times, kinds, notes, vels, note_to_key, key_idx,
+                    cfg.always_tap, inv_speed, tap_seconds
+                )
+                keys_by_bit = list(key_idx)
+                self._save_cached_schedule(cache_path, ev_times, ev_keys, ev_press, keys_by_bit)
+
+            # parse/schedule ran inside the lead-in window; only sleep
+            # whatever of it is left before the first note
+            remaining = cfg.lead_in - (time.perf_counter() - lead_in_t0)
+            if remaining > 0:
+                time.sleep(remaining)
+
+            # one bit per key_idx entry tracks what is physically down
+            down_mask = 0
             MIN_UP = 0.01
 
-            for t, msgs in groups:
-                if self._stop_event.is_set():
+            # the timed loop below is allocation-light, so a GC cycle mid-tap
+            # is pure jitter — hold collection off until playback ends
+            gc.disable()
+
+            # hot-loop locals: LOAD_FAST instead of attribute lookups per event
+            press = kb.press
+            release = kb.release
+            press_many = kb.press_many
+            release_many = kb.release_many
+            sleep = time.sleep
+            sleep_until = precise_sleep_until
+            stop_is_set = self._stop_event.is_set
+
+            # absolute deadlines against one perf_counter origin — sleep
+            # overruns and key-dispatch time no longer accumulate as drift;
+            # one vectorized add leaves a single array read per event
+            t_start = time.perf_counter() - (float(ev_times[0]) if len(ev_times) else 0.0)
+            deadlines = t_start + ev_times
+
+            # runs of same-time same-kind events (chords) dispatch as one
+            # batched call — a single syscall on the SendInput backend
+            i = 0
+            n_ev = len(ev_times)
+            while i < n_ev:
+                if stop_is_set():
                     break
 
-                dt = (t - prev_t) / max(self.cfg.speed, 1e-6)
-                if dt > 0:
-                    time.sleep(dt)
-                prev_t = t
-
-                if self.cfg.always_tap:
-                    keys: List[str] = []
-                    for msg in msgs:
-                        if msg.is_meta:
-                            continue
-                        if msg.type == "note_on" and getattr(msg, "velocity", 0) > 0:
-                            k = midi_note_to_key(msg.note, self.cfg)
-                            if k is not None:
-                                keys.append(k)
-
-                    # dedupe
-                    seen = set()
-                    keys = [k for k in keys if not (k in seen or seen.add(k))]
-
-                    for k in keys:
-                        kb.press(k)
-                    if keys:
-                        time.sleep(tap_seconds)
-                        for k in keys:
-                            kb.release(k)
-                    
+                t_i = ev_times[i]
+                sleep_until(deadlines[i])
+
+                is_press = ev_press[i]
+                j = i + 1
+                while j < n_ev and ev_press[j] == is_press and ev_times[j] == t_i:
+                    j += 1
+
+                if is_press:
+                    chord: List[str] = []
+                    for x in range(i, j):
+                        ki = int(ev_keys[x])  # plain int: uint8 shifts wrap
+                        bit = 1 << ki
+                        k = keys_by_bit[ki]
+                        if down_mask & bit:
+                            # re-strike: flush the batch so order is kept,
+                            # then let the target register the release
+                            if chord:
+                                press_many(chord) if len(chord) > 1 else press(chord[0])
+                                chord = []
+                            release(k)
+                            sleep(MIN_UP)
+                            press(k)
+                        else:
+                            chord.append(k)
+                        down_mask |= bit
+                    if len(chord) == 1:
+                        press(chord[0])
+                    elif chord:
+                        press_many(chord)
                 else:
-                    for msg in msgs:
-                        if msg.is_meta:
-                            continue
-
-                        if msg.type == "note_on" and getattr(msg, "velocity", 0) > 0:
-                            k = midi_note_to_key(msg.note, self.cfg)
-                            if k is None:
-                                continue
-                            if key_down.get(k, False):
-                                kb.release(k)
-                                time.sleep(MIN_UP)
-                                key_down[k] = False
-                            kb.press(k)
-                            key_down[k] = True
-
-                        elif msg.type == "note_off" or (msg.type == "note_on" and getattr(msg, "velocity", 0) == 0):
-                            k = midi_note_to_key(msg.note, self.cfg)
-                            if k is None:
-                                continue
-                            if key_down.get(k, False):
-                                kb.release(k)
-                                key_down[k] = False
-
-            for k, down in list(key_down.items()):
-                if down:
-                    kb.release(k)
-
-            self._ui(lambda: self._log("Stopped." if self._stop_event.is_set() else "Done."))
+                    chord = []
+                    for x in range(i, j):
+                        ki = int(ev_keys[x])
+                        bit = 1 << ki
+                        if down_mask & bit:
+                            chord.append(keys_by_bit[ki])
+                            down_mask &= ~bit
+                    if len(chord) == 1:
+                        release(chord[0])
+                    elif chord:
+                        release_many(chord)
+
+                i = j
+
+            # release whatever is still held: walk the set bits
+            while down_mask:
+                bit_i = (down_mask & -down_mask).bit_length() - 1
+                release(keys_by_bit[bit_i])
+                down_mask &= down_mask - 1
+
+            self._log_async("Stopped." if self._stop_event.is_set() else "Done.")
 
         except Exception as e:
-            self._ui(lambda: self._log(f"ERROR: {e}"))
+            self._log_async(f"ERROR: {e}")
         finally:
-            self._ui(lambda: self.play_btn.config(state=("normal" if self.cfg.midi_path else "disabled")))
-            self._ui(lambda: self.stop_btn.config(state="disabled"))
+            if WINDOWS:
+                ctypes.windll.winmm.timeEndPeriod(1)
+            # a superseded worker (user hit Play again) must not re-enable
+            # GC under the new one or flip its buttons
+            if threading.current_thread() is self._play_thread:
+                gc.enable()
+                self._ui(lambda: self.play_btn.config(state=("normal" if self.cfg.midi_path else "disabled")))
+                self._ui(lambda: self.stop_btn.config(state="disabled"))
 
     def _ui(self, fn):
         self.after(0, fn)